@@ -11,8 +11,6 @@ except ImportError as err:
     transformers = None
     transformers_err = err
 
-import math
-
 import torch
 import torch.nn as nn
 from loguru import logger
@@ -60,11 +58,18 @@ class SparseGptWrapper(ModuleCompressionWrapper):
             if len(inp.shape) == 3:
                 inp = inp.reshape((-1, inp.shape[-1]))
             inp = inp.t()
-        self.H *= self.nsamples / (self.nsamples + tmp)
+        # the host-side count keeps the rescale factors plain floats without
+        # reading the device buffer back every batch
+        prev_samples = self._nsamples_host
+        total_samples = prev_samples + tmp
+        self._nsamples_host = total_samples
         self.nsamples += tmp
-        inp = inp.to(dtype=self.H.dtype)
-        inp = math.sqrt(2 / self.nsamples) * inp
-        self.H += inp.matmul(inp.t()).to(self.dev)
+        inp = inp.to(device=self.H.device, dtype=self.H.dtype)
+        # fold the running-average rescale and the new contribution into a
+        # single fused GEMM: H = (prev/total) * H + (2/total) * inp @ inp.T
+        self.H.addmm_(
+            inp, inp.t(), beta=prev_samples / total_samples, alpha=2.0 / total_samples
+        )
 
     def compress(
         self,
@@ -1,13 +1,41 @@
+import functools
+import inspect
 import time
 from typing import Tuple
 
 from compressed_tensors.quantization import ActivationOrdering, QuantizationStrategy
 from compressed_tensors.quantization.lifecycle.forward import fake_quantize
 
+try:
+    # fused quantize-dequantize internals, used to skip the strategy dispatch
+    # and range calculation that fake_quantize performs on every call. these
+    # are private upstream symbols whose arity has changed across releases,
+    # so only take the fused path when the signatures are the expected ones
+    from compressed_tensors.quantization.lifecycle.forward import (
+        _dequantize,
+        _quantize,
+    )
+    from compressed_tensors.quantization.utils import calculate_range
+
+    if tuple(inspect.signature(_quantize).parameters)[:6] != (
+        "x",
+        "scale",
+        "zero_point",
+        "q_min",
+        "q_max",
+        "args",
+    ) or tuple(inspect.signature(_dequantize).parameters)[:3] != (
+        "x_q",
+        "scale",
+        "zero_point",
+    ):
+        raise ImportError("unexpected compressed-tensors quantization internals")
+except ImportError:
+    _quantize = _dequantize = calculate_range = None
+
 from llmcompressor.modifiers.utils import SPARSITY_THRESHOLD
 from llmcompressor.modifiers.utils.compression_wrapper import ModuleCompressionWrapper
 from llmcompressor.observers import Observer
-from llmcompressor.pytorch.utils.helpers import tensor_sparsity
 from llmcompressor.utils import getattr_chain
 from llmcompressor.utils.metric_logging import get_GPU_memory_usage, get_layer_size_mb
 
@@ -33,6 +61,77 @@ from loguru import logger
 __all__ = ["GPTQWrapper"]
 
 
+def _quantize_column(
+    q: torch.Tensor,
+    scale: torch.Tensor,
+    zero_point: torch.Tensor,
+    quant_args,
+    q_range,
+) -> torch.Tensor:
+    """
+    Quantize and dequantize a single weight column. Uses the fused
+    quantize-dequantize path with a precomputed quantization range when
+    available, falling back to fake_quantize otherwise
+
+    :param q: column to quantize
+    :param scale: quantization scale for the column
+    :param zero_point: quantization zero point for the column
+    :param quant_args: quantization arguments for the layer
+    :param q_range: optional precomputed (q_min, q_max) quantization range
+    :return: fake quantized column
+    """
+    if q_range is None:
+        return fake_quantize(q, scale, zero_point, quant_args)
+
+    q_min, q_max = q_range
+    quantized = _quantize(q, scale, zero_point, q_min, q_max, quant_args)
+    return _dequantize(quantized, scale, zero_point)
+
+
+def _invert_permutation(perm: torch.Tensor) -> torch.Tensor:
+    """
+    Invert a permutation with a scatter instead of a full argsort
+
+    :param perm: permutation indices to invert
+    :return: inverse permutation indices
+    """
+    invperm = torch.empty_like(perm)
+    invperm[perm] = torch.arange(perm.numel(), device=perm.device)
+    return invperm
+
+
+def _compile_if_available(fn):
+    """
+    Compile a function with torch.compile on first invocation when the
+    running torch supports it, falling back to the eager function on torch
+    versions or platforms where compilation is unavailable
+    """
+    compiled = None
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        nonlocal compiled
+        if compiled is None:
+            compiled = fn
+            if hasattr(torch, "compile"):
+                try:
+                    # raises on platforms torch.compile does not support,
+                    # e.g. Windows and too-new python versions
+                    compiled = torch.compile(fn, dynamic=True, fullgraph=False)
+                except RuntimeError:
+                    pass
+            if compiled is not fn:
+                try:
+                    # backend failures (missing compiler toolchain, broken
+                    # triton) only surface on the first invocation
+                    return compiled(*args, **kwargs)
+                except Exception:
+                    compiled = fn
+        return compiled(*args, **kwargs)
+
+    return wrapper
+
+
 class GPTQWrapper(ModuleCompressionWrapper):
     """
     Runs GPTQ on a single module that contains no sub-modules
@@ -57,6 +156,14 @@ class GPTQWrapper(ModuleCompressionWrapper):
             ),
         )
 
+        # side stream used to overlap Hessian accumulation with the
+        # calibration forward pass, CUDA only
+        self._h_stream = (
+            torch.cuda.Stream(device=self.dev)
+            if torch.device(self.dev).type == "cuda"
+            else None
+        )
+
     def add_batch(self, inp: torch.Tensor, out: torch.Tensor):
         """
         Add a batch of layer input and output data to the Hessian calculation
@@ -73,11 +180,30 @@ class GPTQWrapper(ModuleCompressionWrapper):
             if len(inp.shape) == 3:
                 inp = inp.reshape((-1, inp.shape[-1]))
             inp = inp.t()
-        self.H *= self.nsamples / (self.nsamples + tmp)
+        # the host-side count keeps the rescale factors plain floats without
+        # reading the device buffer back every batch
+        prev_samples = self._nsamples_host
+        total_samples = prev_samples + tmp
+        self._nsamples_host = total_samples
         self.nsamples += tmp
-        inp = inp.to(dtype=self.H.dtype)
-        inp = math.sqrt(2 / self.nsamples) * inp
-        self.H += inp.matmul(inp.t())
+
+        # fold the running-average rescale and the new contribution into a
+        # single fused GEMM: H = (prev/total) * H + (2/total) * inp @ inp.T
+        beta = prev_samples / total_samples
+        alpha = 2.0 / total_samples
+        if self._h_stream is None:
+            inp = inp.to(device=self.H.device, dtype=self.H.dtype)
+            self.H.addmm_(inp, inp.t(), beta=beta, alpha=alpha)
+        else:
+            # issue the accumulation on the side stream so it overlaps with
+            # the rest of the calibration forward pass
+            self._h_stream.wait_stream(torch.cuda.current_stream())
+            with torch.cuda.stream(self._h_stream):
+                inp_f = inp.to(device=self.H.device, dtype=self.H.dtype)
+                self.H.addmm_(inp_f, inp_f.t(), beta=beta, alpha=alpha)
+            # the activation is owned by the default stream; mark it in use
+            # by the side stream so the allocator does not recycle it early
+            inp.record_stream(self._h_stream)
 
     def compress(
         self,
@@ -92,6 +218,11 @@ class GPTQWrapper(ModuleCompressionWrapper):
         :param percdamp: Amount of dampening to apply to H, as a fraction of the
             diagonal norm
         """
+        if self._h_stream is not None:
+            # wait for any in-flight Hessian accumulation before H is read,
+            # or freed in the case of skipped layers
+            torch.cuda.current_stream().wait_stream(self._h_stream)
+
         args_loc = "quantization_scheme.weights"
         quant_args = getattr_chain(self.layer, args_loc, None)
         if quant_args is None:
@@ -150,15 +281,27 @@ class GPTQWrapper(ModuleCompressionWrapper):
         else:
             scale, zero_point = observer(W, g_idx=None)
 
-        # sparsity mask
-        sparsity = tensor_sparsity(W)
-        preserve_zeros = sparsity >= SPARSITY_THRESHOLD
-        W_nz_mask = (
-            (~torch.isclose(W, torch.zeros(1, device=W.device).float())).float()
-            if preserve_zeros
+        # work with float zero points during the loop so the per-column
+        # quantize does not recast them on every call; restored below
+        zero_point_dtype = zero_point.dtype
+        zero_point = zero_point.to(W.dtype)
+
+        # precompute the quantization range once so per-column quantization can
+        # use the fused quantize-dequantize path
+        q_range = (
+            calculate_range(quant_args, W.device)
+            if calculate_range is not None
             else None
         )
 
+        # sparsity mask, kept as bool to avoid materializing a full-size
+        # floating point mask
+        zero_mask = W == 0
+        sparsity = zero_mask.sum() / W.numel()
+        preserve_zeros = sparsity >= SPARSITY_THRESHOLD
+        W_nz_mask = ~zero_mask if preserve_zeros else None
+        del zero_mask
+
         # mask dead hessian values
         dead = torch.diag(self.H) == 0
         self.H[dead, dead] = 1
@@ -168,13 +311,14 @@ class GPTQWrapper(ModuleCompressionWrapper):
 
         # compute inverse hessian in place to save memory
         try:
-            damp = percdamp * torch.mean(torch.diag(self.H))
-            diag = torch.arange(self.columns, device=self.dev)
-            self.H[diag, diag] += damp
+            damp = percdamp * self.H.diagonal().mean()
+            self.H.diagonal().add_(damp)
             self.H = torch.linalg.cholesky(self.H)
             self.H = torch.cholesky_inverse(self.H)
-            self.H = torch.linalg.cholesky(self.H, upper=True)
-            Hinv = self.H
+            Hinv = torch.linalg.cholesky(self.H, upper=True)
+            # the hessian itself is no longer needed; release it before the
+            # block loop to lower peak memory
+            self.H = None
         except torch._C._LinAlgError:
             raise ValueError(
                 "Failed to invert hessian due to numerical instability. Consider "
@@ -182,107 +326,96 @@ class GPTQWrapper(ModuleCompressionWrapper):
                 "of calibration samples, or shuffling the calibration dataset"
             )
 
+        # preallocate per-block buffers once; every column is written by the
+        # block loop so the reused storage never needs zeroing
+        max_count = min(blocksize, self.columns)
+        W1_buf = torch.empty((self.rows, max_count), device=W.device, dtype=W.dtype)
+        Q1_buf = torch.empty_like(W1_buf)
+        Err1_buf = torch.empty_like(W1_buf)
+        Losses1_buf = torch.empty_like(W1_buf)
+
         # See section 3.4 of https://arxiv.org/abs/2203.07259
         for i1 in range(0, self.columns, blocksize):
             i2 = min(i1 + blocksize, self.columns)
             count = i2 - i1
 
-            W1 = W[:, i1:i2].clone()
-            Q1 = torch.zeros_like(W1)
-            Err1 = torch.zeros_like(W1)
-            Losses1 = torch.zeros_like(W1)
-            Hinv1 = Hinv[i1:i2, i1:i2]
-
-            if preserve_zeros:
-                W1_nz_mask = W_nz_mask[:, i1:i2]
-
-            for i in range(count):
-                w = W1[:, i]
-                d = Hinv1[i, i]
-                q = w.clone()
-
-                # quantize column
-                if strategy == QuantizationStrategy.TENSOR:
-                    q = fake_quantize(
-                        q,
-                        scale,
-                        zero_point,
-                        self.layer.quantization_scheme.weights,
-                    )
-                elif strategy == QuantizationStrategy.CHANNEL:
-                    q = fake_quantize(
-                        q,
-                        scale[:, 0],
-                        zero_point[:, 0],
-                        quant_args,
-                    )
-                elif strategy == QuantizationStrategy.GROUP:
-                    # get the group index for the current column
-                    column_idx = i1 + i
-                    group_index = g_idx[column_idx]
-
+            scale_cols = zp_cols = None
+            if strategy == QuantizationStrategy.GROUP:
+                if actorder != ActivationOrdering.WEIGHT:
                     # update quantization parameters to reflect changes
-                    # resulting from previous blocks
-                    if (
-                        actorder != ActivationOrdering.WEIGHT
-                        and column_idx % quant_args.group_size == 0
-                    ):
+                    # resulting from previous blocks. W is only written after a
+                    # block completes, so refreshing every group that starts in
+                    # this block up front matches the previous mid-loop refresh
+                    # exactly. the refresh only runs with an identity group
+                    # mapping, so each group is a contiguous column slice
+                    group_size = quant_args.group_size
+                    first_group = math.ceil(i1 / group_size)
+                    last_group = math.ceil(i2 / group_size)
+                    for group_index in range(first_group, last_group):
+                        start = group_index * group_size
+                        end = min(start + group_size, self.columns)
                         _scale, _zero_point = observer.get_qparams_along_dim(
-                            W[:, g_idx == group_index], dim=0
+                            W[:, start:end], dim=0
                         )
                         scale[:, group_index] = _scale[:, 0]
                         zero_point[:, group_index] = _zero_point[:, 0]
 
-                    # Since we're only applying quantization to a slice, this
-                    # ends up being a channelwise application
-                    altered_qargs = copy(quant_args)
-                    altered_qargs.strategy = QuantizationStrategy.CHANNEL
-                    q = fake_quantize(
-                        q,
-                        scale[:, group_index],
-                        zero_point[:, group_index],
-                        altered_qargs,
-                    )
-                else:
-                    raise ValueError(
-                        "Quantization strategy is not supported for GPTQ: "
-                        f"{strategy}"
-                    )
-
-                # propagate column error
-                Q1[:, i] = q
-                Losses1[:, i] = (w - q) ** 2 / d**2
-
-                err1 = (w - q) / d
-                w1_err = err1.unsqueeze(1).matmul(Hinv1[i, i:].unsqueeze(0))
-                if preserve_zeros:
-                    W1[:, i:] -= w1_err * W1_nz_mask[:, i:]
-                else:
-                    W1[:, i:] -= w1_err
-                Err1[:, i] = err1
+                # gather the quantization parameters used by each column of
+                # this block once, instead of indexing by group per column
+                scale_cols = scale.index_select(1, g_idx[i1:i2])
+                zp_cols = zero_point.index_select(1, g_idx[i1:i2])
+
+            W1 = W1_buf[:, :count]
+            W1.copy_(W[:, i1:i2])
+            Q1 = Q1_buf[:, :count]
+            Err1 = Err1_buf[:, :count]
+            Losses1 = Losses1_buf[:, :count]
+            Hinv1 = Hinv[i1:i2, i1:i2]
+            W1_nz_mask = W_nz_mask[:, i1:i2] if preserve_zeros else None
+
+            self._compress_block(
+                W1,
+                Hinv1,
+                Q1,
+                Err1,
+                Losses1,
+                scale,
+                zero_point,
+                scale_cols,
+                zp_cols,
+                quant_args,
+                strategy,
+                W1_nz_mask,
+                q_range,
+            )
 
             # propagate block error
-            W[:, i1:i2] = Q1
-            Losses += torch.sum(Losses1, 1) / 2
+            W[:, i1:i2].copy_(Q1)
+            Losses.add_(Losses1.sum(1), alpha=0.5)
 
-            w_err = Err1.matmul(Hinv[i1:i2, i2:])
             if preserve_zeros:
-                W[:, i2:] -= w_err * W_nz_mask[:, i2:]
+                w_err = Err1.matmul(Hinv[i1:i2, i2:])
+                W[:, i2:].sub_(w_err * W_nz_mask[:, i2:])
             else:
-                W[:, i2:] -= w_err
+                # fused GEMM-subtract, no intermediate error tensor
+                W[:, i2:].addmm_(Err1, Hinv[i1:i2, i2:], alpha=-1)
 
         if "METRIC" in logger._core.levels.keys():
             self._log_metrics(tick, Losses)
 
+        # release block buffers and the inverse hessian before the final
+        # reshape materializes another full-size weight
+        del W1_buf, Q1_buf, Err1_buf, Losses1_buf, Hinv, W_nz_mask
+
         if strategy == QuantizationStrategy.GROUP:
             if actorder == ActivationOrdering.WEIGHT:
                 # restore original permutation
-                invperm = torch.argsort(perm)
+                invperm = _invert_permutation(perm)
                 W = W[:, invperm]
 
             elif actorder == ActivationOrdering.GROUP:
                 # restore original permutation
-                invperm = torch.argsort(perm)
+                invperm = _invert_permutation(perm)
                 W = W[:, invperm]
                 g_idx = g_idx[invperm]
 
@@ -294,18 +427,116 @@ class GPTQWrapper(ModuleCompressionWrapper):
         W = W.reshape(final_shape).to(final_dtype)
 
         update_parameter_data(self.layer, scale, "weight_scale")
-        update_parameter_data(self.layer, zero_point, "weight_zero_point")
+        update_parameter_data(
+            self.layer, zero_point.to(zero_point_dtype), "weight_zero_point"
+        )
 
-        # This is a bit hacky, but FSDP updates only work if we change
-        # the weight in place, clone() or direct assignment won't work
-        self.layer.weight -= self.layer.weight
-        self.layer.weight += W
+        # FSDP updates only work if we change the weight in place; copy_
+        # preserves the tensor identity that the flat-param hooks rely on
+        with torch.no_grad():
+            self.layer.weight.data.copy_(W)
 
         if is_module_offloaded(self.layer):
             device = get_offloaded_device(self.layer)
             update_prefix_dict(self.layer, "weight", self.layer.weight.to(device))
             self.layer._hf_hook.post_forward(self.layer, None)
 
+    @_compile_if_available
+    def _compress_block(
+        self,
+        W1: torch.Tensor,
+        Hinv1: torch.Tensor,
+        Q1: torch.Tensor,
+        Err1: torch.Tensor,
+        Losses1: torch.Tensor,
+        scale: torch.Tensor,
+        zero_point: torch.Tensor,
+        scale_cols,
+        zp_cols,
+        quant_args,
+        strategy,
+        W1_nz_mask: torch.Tensor,
+        q_range=None,
+    ):
+        """
+        Quantize a single block of columns, propagating quantization error to the
+        remaining columns of the block in place
+
+        :param W1: block of weight columns to quantize, updated in place
+        :param Hinv1: block of the inverse hessian cholesky factor
+        :param Q1: preallocated output buffer for the quantized block
+        :param Err1: preallocated output buffer for the block error
+        :param Losses1: preallocated output buffer for the block losses
+        :param scale: quantization scales for the full weight
+        :param zero_point: quantization zero points for the full weight
+        :param scale_cols: per-column scales for the block, GROUP strategy only
+        :param zp_cols: per-column zero points for the block, GROUP strategy only
+        :param quant_args: quantization arguments for the layer
+        :param strategy: quantization strategy for the layer
+        :param W1_nz_mask: mask of non-zero block weights, used to preserve sparsity
+        :param q_range: optional precomputed quantization range for fused
+            quantize-dequantize
+        """
+        count = W1.shape[1]
+
+        if strategy == QuantizationStrategy.GROUP:
+            # each column is quantized with its own group's parameters, which
+            # makes this a channelwise application from the quantizer's
+            # perspective; build the altered args once per block
+            quant_args = copy(quant_args)
+            quant_args.strategy = QuantizationStrategy.CHANNEL
+
+        # index the cholesky diagonal once per block; the per-column values
+        # stay on-device so the error division below never syncs with the host
+        diag_Hinv1 = Hinv1.diagonal()
+
+        for i in range(count):
+            w = W1[:, i]
+            d = diag_Hinv1[i]
+
+            # quantize column
+            if strategy == QuantizationStrategy.TENSOR:
+                q = _quantize_column(
+                    w,
+                    scale,
+                    zero_point,
+                    quant_args,
+                    q_range,
+                )
+            elif strategy == QuantizationStrategy.CHANNEL:
+                q = _quantize_column(
+                    w,
+                    scale[:, 0],
+                    zero_point[:, 0],
+                    quant_args,
+                    q_range,
+                )
+            elif strategy == QuantizationStrategy.GROUP:
+                q = _quantize_column(
+                    w,
+                    scale_cols[:, i],
+                    zp_cols[:, i],
+                    quant_args,
+                    q_range,
+                )
+            else:
+                raise ValueError(
+                    "Quantization strategy is not supported for GPTQ: " f"{strategy}"
+                )
+
+            # propagate column error
+            Q1[:, i] = q
+            Losses1[:, i] = (w - q) ** 2 / d**2
+
+            err1 = (w - q) / d
+            if W1_nz_mask is not None:
+                w1_err = torch.outer(err1, Hinv1[i, i:])
+                W1[:, i:].sub_(w1_err * W1_nz_mask[:, i:])
+            else:
+                # BLAS rank-1 update in place of unsqueeze+matmul+sub
+                W1[:, i:].addr_(err1, Hinv1[i, i:], alpha=-1)
+            Err1[:, i] = err1
+
     def free(self):
         """
         Free the Hessian memory after the layer is complete
@@ -321,8 +552,12 @@ class GPTQWrapper(ModuleCompressionWrapper):
 
         :param W: weight to permute
         """
-        perm = torch.argsort(torch.diag(H), descending=True)
-        return W[:, perm], H[perm][:, perm], perm
+        perm = torch.sort(H.diagonal(), descending=True, stable=False).indices
+        return (
+            W.index_select(1, perm),
+            H.index_select(0, perm).index_select(1, perm),
+            perm,
+        )
 
     def _log_metrics(self, start_tick: float, losses: torch.Tensor):
         """
@@ -59,6 +59,9 @@ class ModuleCompressionWrapper(Module, ABC):
         self.register_buffer(
             "nsamples", torch.zeros(1, dtype=torch.int32, device=self.dev)
         )
+        # host-side mirror of nsamples so per-batch hooks can read the count
+        # without synchronizing on the device buffer
+        self._nsamples_host = 0
 
     def forward(self, *args, **kwargs):
         """
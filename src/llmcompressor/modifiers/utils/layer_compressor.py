@@ -129,12 +129,13 @@ class LayerCompressor:
         :return: outputs of the layer
         """
         outputs = [None for _ in range(len(intermediates))]
+        # the layer's device does not change while it is being calibrated
+        device = get_execution_device(self.layer)
         for idx in tqdm(range(len(intermediates))):
             args, kwargs = intermediates[idx]
-            device = get_execution_device(self.layer)
             output = self.layer(*tensors_to_device(args, device), **kwargs)
             outputs[idx] = (tensors_to_device(output, "cpu"), kwargs)
-            torch.cuda.empty_cache()
+        torch.cuda.empty_cache()
 
         return outputs
 
@@ -165,16 +166,15 @@ class LayerCompressor:
         """
         Apply compression to each wrapped submodule in the layer
         """
-
-        @torch.no_grad()
-        def compress_module(module):
-            if isinstance(module, self.module_compressor_class):
+        # self.modules already holds exactly the wrappers, so there is no
+        # need to rediscover them by walking the module tree
+        with torch.no_grad():
+            for module in self.modules.values():
                 full_name = self._get_full_submodule_name(module.name)
                 logger.info(f"Compressing {full_name}...")
                 module.compress(**self.args)
                 module.free()
 
-        self.layer.apply(compress_module)
         torch.cuda.empty_cache()
 
     def _get_full_submodule_name(self, name):
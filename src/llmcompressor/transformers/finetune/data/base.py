@@ -7,6 +7,7 @@ from compressed_tensors.registry import RegistryMixin
 from datasets import Dataset, IterableDataset
 from datasets.formatting.formatting import LazyRow
 from loguru import logger
+from transformers import PreTrainedTokenizerFast
 
 from llmcompressor.transformers.finetune.data.data_args import DataTrainingArguments
 from llmcompressor.transformers.finetune.data.data_helpers import (
@@ -39,6 +40,10 @@ class TextGenerationDataset(RegistryMixin):
     # used to mask out the prompt so prompt tokens do not contribute to training loss
     PROMPT_KEY = "prompt"
 
+    # set by subclasses whose dataset_template processes batches (dicts of
+    # lists) rather than single rows
+    preprocessing_batched = False
+
     def __init__(
         self,
         data_args: DataTrainingArguments,
@@ -91,11 +96,17 @@ class TextGenerationDataset(RegistryMixin):
         logger.debug(f"Raw dataset: {get_columns(dataset)}")
 
         if self.preprocess is not None:
-            # preprocess: apply template or preprocessing function
+            # preprocess: apply template or preprocessing function. batched
+            # templates cut per-row Python dispatch; user-provided
+            # preprocessing functions are always row-wise
+            batched = (
+                self.preprocessing_batched
+                and self.data_args.preprocessing_func is None
+            )
             dataset = self.map(
                 dataset,
                 self.preprocess,
-                batched=False,
+                batched=batched,
                 num_proc=self.data_args.preprocessing_num_workers,
                 desc="Preprocessing",
             )
@@ -109,10 +120,14 @@ class TextGenerationDataset(RegistryMixin):
             # tokenize/ process
             dataset = self.filter_tokenizer_args(dataset)
             logger.debug(f"Tokenizer args after filtering: {get_columns(dataset)}")
+            # fast tokenizers encode whole batches in Rust; vision and slow
+            # processors keep the row-wise path, as batching is not well
+            # supported for vision processors
+            batched = isinstance(self.processor, PreTrainedTokenizerFast)
             dataset = self.map(
                 dataset,
                 self.tokenize,
-                batched=False,  # batching is not well supported for vision processors
+                batched=batched,
                 keep_in_memory=True,  # bug occurs when not batched and not in memory,
                 # subsequent ds.map calls are always batched,
                 # regardless of `batched` argument
@@ -163,6 +178,9 @@ class TextGenerationDataset(RegistryMixin):
         :return: the requested dataset
         """
         if self.data_args.dataset_path is not None:
+            # data_args may share raw_kwargs with the caller after the shallow
+            # dataclass copy in subclass constructors; copy before mutating
+            self.data_args.raw_kwargs = dict(self.data_args.raw_kwargs)
             if self.data_args.dvc_data_repository is not None:
                 self.data_args.raw_kwargs["storage_options"] = {
                     "url": self.data_args.dvc_data_repository
@@ -11,16 +11,54 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from copy import deepcopy
+from dataclasses import replace
 from typing import TYPE_CHECKING
 
+from datasets import IterableDataset
+
 from llmcompressor.transformers.finetune.data import TextGenerationDataset
+from llmcompressor.transformers.finetune.data.base import get_columns
 from llmcompressor.typing import Processor
 
 if TYPE_CHECKING:
     from llmcompressor.transformers import DataTrainingArguments as DataArgs
 
 
+def _has_output(batch):
+    return [bool(output) for output in batch["output"]]
+
+
+EVOL_ALPACA_TEMPLATE = (
+    "Below is an instruction that describes a "
+    "programming task. Write a program that appropriately "
+    "completes the request.\n\n### Instruction:\n{instruction}"
+    "\n\n### Response:\n"
+)
+
+# split once at import time so the per-row path is plain string concatenation
+# instead of a format-string parse
+_TEMPLATE_PREFIX, _TEMPLATE_SUFFIX = EVOL_ALPACA_TEMPLATE.split("{instruction}")
+
+
+def _apply_template(batch):
+    prompts = [
+        _TEMPLATE_PREFIX + instruction + _TEMPLATE_SUFFIX
+        for instruction in batch["instruction"]
+    ]
+    if "output" in batch:
+        texts = [
+            f"{prompt}{output}" if output else prompt
+            for prompt, output in zip(prompts, batch["output"])
+        ]
+    else:
+        texts = prompts
+
+    return {
+        "text": texts,
+        TextGenerationDataset.PROMPT_KEY: prompts,
+    }
+
+
 @TextGenerationDataset.register(name="evolcodealpaca")
 class EvolCodeAlpacaDataset(TextGenerationDataset):
     """
@@ -31,27 +69,38 @@ class EvolCodeAlpacaDataset(TextGenerationDataset):
     :param processor: processor or tokenizer to use on dataset
     """
 
-    EVOL_ALPACA_TEMPLATE = (
-        "Below is an instruction that describes a "
-        "programming task. Write a program that appropriately "
-        "completes the request.\n\n### Instruction:\n{instruction}"
-        "\n\n### Response:\n"
-    )
+    EVOL_ALPACA_TEMPLATE = EVOL_ALPACA_TEMPLATE
+
+    preprocessing_batched = True
+
+    # a module-level function carries no bound instance, so the datasets
+    # fingerprint hash is stable across runs and processes
+    dataset_template = staticmethod(_apply_template)
 
     def __init__(self, data_args: "DataArgs", split: str, processor: Processor):
-        data_args = deepcopy(data_args)
+        data_args = replace(data_args)
         data_args.dataset = "theblackcat102/evol-codealpaca-v1"
         data_args.text_column = "text"
 
         super().__init__(data_args, split=split, processor=processor)
 
-    def dataset_template(self, sample):
-        prompt = self.EVOL_ALPACA_TEMPLATE.format(instruction=sample["instruction"])
-        text = prompt
-        if "output" in text:
-            text += sample["output"]
+    def load_dataset(self):
+        dataset = super().load_dataset()
+
+        # streaming datasets may not have resolved their features yet, in
+        # which case the column names are unknown until after iteration
+        columns = get_columns(dataset)
+        if columns is not None and "output" in columns:
+            # drop rows without a response up front so every downstream pass
+            # (tokenization, packing, training) skips them
+            kwargs = (
+                {}
+                if isinstance(dataset, IterableDataset)
+                else {
+                    "num_proc": self.data_args.preprocessing_num_workers,
+                    "desc": "Filtering empty responses",
+                }
+            )
+            dataset = dataset.filter(_has_output, batched=True, **kwargs)
 
-        return {
-            "text": text,
-            self.PROMPT_KEY: prompt,
-        }
+        return dataset
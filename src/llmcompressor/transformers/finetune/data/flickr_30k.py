@@ -1,4 +1,4 @@
-from copy import deepcopy
+from dataclasses import replace
 from typing import TYPE_CHECKING
 
 from loguru import logger
@@ -32,7 +32,7 @@ class Flickr30K(TextGenerationDataset):
     )
 
     def __init__(self, data_args: "DataArgs", split: str, processor: Processor):
-        data_args = deepcopy(data_args)
+        data_args = replace(data_args)
         data_args.dataset = "lmms-lab/flickr30k"
 
         super().__init__(data_args=data_args, split=split, processor=processor)
@@ -1,4 +1,4 @@
-from copy import deepcopy
+from dataclasses import replace
 from typing import TYPE_CHECKING
 
 from llmcompressor.transformers.finetune.data import TextGenerationDataset
@@ -21,7 +21,7 @@ class GSM8KDataset(TextGenerationDataset):
     GSM_TEMPLATE = "Question: {question}\nAnswer:"
 
     def __init__(self, data_args: "DataArgs", split: str, processor: Processor):
-        data_args = deepcopy(data_args)
+        data_args = replace(data_args)
         data_args.dataset = "gsm8k"
         data_args.text_column = "text"
 
@@ -1,4 +1,4 @@
-from copy import deepcopy
+from dataclasses import replace
 from typing import TYPE_CHECKING
 
 from llmcompressor.transformers.finetune.data import TextGenerationDataset
@@ -19,7 +19,7 @@ class WikiTextDataset(TextGenerationDataset):
     """
 
     def __init__(self, data_args: "DataArgs", split: str, processor: Processor):
-        data_args = deepcopy(data_args)
+        data_args = replace(data_args)
         data_args.dataset = "Salesforce/wikitext"
         data_args.text_column = "text"
 
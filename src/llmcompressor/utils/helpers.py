@@ -7,6 +7,7 @@ import ast
 import contextlib
 import errno
 import fnmatch
+import functools
 import glob
 import importlib.metadata
 import importlib.util
@@ -991,9 +992,12 @@ def is_package_available(
         return package_exists
 
 
+@functools.lru_cache(maxsize=None)
 def import_from_path(path: str) -> str:
     """
     Import the module and the name of the function/class separated by :
+    Repeated lookups of the same path are cached, so sweeps that rebuild
+    datasets do not redo the filesystem and import work.
     Examples:
       path = "/path/to/file.py:func_or_class_name"
       path = "/path/to/file:focn"
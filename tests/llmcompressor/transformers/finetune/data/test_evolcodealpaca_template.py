@@ -0,0 +1,42 @@
+import unittest
+
+import pytest
+
+from llmcompressor.transformers.finetune.data.base import TextGenerationDataset
+from llmcompressor.transformers.finetune.data.evolcodealpaca import (
+    EVOL_ALPACA_TEMPLATE,
+    _apply_template,
+    _has_output,
+)
+
+PROMPT_KEY = TextGenerationDataset.PROMPT_KEY
+
+
+@pytest.mark.unit
+class TestEvolCodeAlpacaTemplate(unittest.TestCase):
+    def test_template_appends_output(self):
+        instruction = "Write a function that returns 42."
+        output = "def answer():\n    return 42"
+        result = _apply_template({"instruction": [instruction], "output": [output]})
+
+        prompt = result[PROMPT_KEY][0]
+        text = result["text"][0]
+        self.assertEqual(prompt, EVOL_ALPACA_TEMPLATE.format(instruction=instruction))
+        self.assertEqual(text, prompt + output)
+        self.assertNotIn(output, prompt)
+
+    def test_template_without_output_column(self):
+        result = _apply_template({"instruction": ["Write a function."]})
+        self.assertEqual(result["text"], result[PROMPT_KEY])
+
+    def test_template_empty_output(self):
+        result = _apply_template(
+            {"instruction": ["first", "second"], "output": ["", "print(1)"]}
+        )
+        self.assertEqual(result["text"][0], result[PROMPT_KEY][0])
+        self.assertEqual(result["text"][1], result[PROMPT_KEY][1] + "print(1)")
+
+    def test_has_output(self):
+        self.assertEqual(
+            _has_output({"output": ["print(1)", "", None]}), [True, False, False]
+        )